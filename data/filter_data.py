@@ -3,13 +3,30 @@
 import os
 import csv
 import gzip
+import io
 import json
+import mmap
 import re
 import logging
 from pathlib import Path
 from typing import Optional
+
 from dotenv import load_dotenv
 
+# rapidgzip decompresses gzip blocks in parallel across cores; plain
+# gzip remains the fallback when it is not installed.
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+# orjson decodes through a C extension several times faster than stdlib
+# json; the stdlib stays as the fallback when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
 # Configuration
@@ -33,9 +50,35 @@ class FileProcessingError(Exception):
     pass
 
 
+# Compiled once at import; covers both 'Mon-YYYY' and 'YYYY-MM-DD' so the
+# pattern never goes through re's bounded cache on the hot path.
+_YEAR_RE = re.compile(r"^(?:[A-Za-z]{3}-)?(\d{4})")
+
+
+# Directories already created this run; repeat calls skip the mkdir
+# syscall (which can be a network round-trip on NFS-backed volumes).
+_ENSURED_DIRS = set()
+
+
 def ensure_directory_exists(path: Path):
     """Ensure the specified directory exists."""
+    if path in _ENSURED_DIRS:
+        return
     path.mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIRS.add(path)
+
+
+# Both Lending Club date layouts are fixed-width, so the year digits sit
+# at known offsets: 'YYYY-MM-DD' at [0:4] and 'Mon-YYYY' at [4:8]. These
+# helpers read them off raw bytes with branchless arithmetic (indexing a
+# bytes object already yields ints), skipping the regex engine, int()
+# dispatch, and any text decoding.
+def _year_yyyy_mm_dd(b: bytes) -> int:
+    return (b[0] - 48) * 1000 + (b[1] - 48) * 100 + (b[2] - 48) * 10 + (b[3] - 48)
+
+
+def _year_mon_yyyy(b: bytes) -> int:
+    return (b[4] - 48) * 1000 + (b[5] - 48) * 100 + (b[6] - 48) * 10 + (b[7] - 48)
 
 
 def parse_date_to_year(date_str: str) -> Optional[int]:
@@ -44,24 +87,16 @@ def parse_date_to_year(date_str: str) -> Optional[int]:
     Handles 'Mon-YYYY' and 'YYYY-MM-DD' formats.
     Returns None if the format is invalid.
     """
-    if not isinstance(date_str, str) or not date_str:
-        return None
-
-    # Handle 'Mon-YYYY' format (e.g., 'Aug-2003')
-    match = re.search(r"(\d{4})", date_str)
-    if match:
-        try:
-            return int(match.group(1))
-        except ValueError:
-            return None
-
-    # Handle 'YYYY-MM-DD' format (e.g., '2007-05-26')
     try:
-        # We can just get the first 4 characters
-        year_str = date_str.split("-")[0]
-        return int(year_str)
-    except (ValueError, IndexError):
+        if len(date_str) == 10 and date_str[4] == "-":
+            return _year_yyyy_mm_dd(date_str.encode("ascii", "replace"))
+        if len(date_str) == 8 and date_str[3] == "-":
+            return _year_mon_yyyy(date_str.encode("ascii", "replace"))
+        match = _YEAR_RE.match(date_str)
+    except TypeError:
+        # Non-string input (e.g., NaN from a pandas cell)
         return None
+    return int(match.group(1)) if match else None
 
 
 def process_file(schema_file_path: Path, start_year: int, end_year: int):
@@ -73,8 +108,12 @@ def process_file(schema_file_path: Path, start_year: int, end_year: int):
         if not schema_file_path.exists():
             raise FileProcessingError(f"Schema file not found: {schema_file_path}")
 
-        with open(schema_file_path, "r") as f:
-            schema_data = json.load(f)
+        if orjson is not None:
+            with open(schema_file_path, "rb") as f:
+                schema_data = orjson.loads(f.read())
+        else:
+            with open(schema_file_path, "r") as f:
+                schema_data = json.load(f)
 
         source_csv_path = Path(schema_data["source_csv"])
         if not source_csv_path.exists():
@@ -87,28 +126,56 @@ def process_file(schema_file_path: Path, start_year: int, end_year: int):
 
         date_col = "issue_d" if "accepted" in table_name else "Application Date"
 
-        open_func = gzip.open if source_csv_path.suffix == ".gz" else open
+        # issue_d is 'Mon-YYYY', Application Date is 'YYYY-MM-DD'; bind the
+        # matching fixed-offset year parser once, before the loop.
+        year_fn = _year_mon_yyyy if date_col == "issue_d" else _year_yyyy_mm_dd
 
         rows_written = 0
-        with open_func(
-            source_csv_path, "rt", encoding="utf-8", errors="ignore"
-        ) as infile:
-            reader = csv.reader(infile)
-            try:
-                header = next(reader)
-                if not header:
-                    raise FileProcessingError(
-                        f"File {source_csv_path.name} is empty or has a blank header."
-                    )
-            except StopIteration:
+        gz_file = None
+        index_path = source_csv_path.with_name(source_csv_path.name + ".gzindex")
+        if source_csv_path.suffix == ".gz":
+            if rapidgzip is not None:
+                # parallelization=0 auto-selects the core count. The
+                # seek-point index is persisted beside the archive so reruns
+                # can skip the initial sequential indexing pass.
+                gz_file = rapidgzip.open(str(source_csv_path), parallelization=0)
+                if index_path.exists():
+                    try:
+                        gz_file.import_index(str(index_path))
+                    except Exception as e:
+                        logging.warning(
+                            f"Could not load gzip index {index_path.name}: {e}"
+                        )
+                infile = io.BufferedReader(gz_file, buffer_size=1 << 20)
+            else:
+                infile = io.BufferedReader(
+                    gzip.open(source_csv_path, "rb"), buffer_size=1 << 20
+                )
+        else:
+            if source_csv_path.stat().st_size == 0:
                 raise FileProcessingError(f"File {source_csv_path.name} is empty.")
-
-            if header and list(next(reader, None)) == header:
-                logging.warning(
-                    f"Duplicate header detected in {source_csv_path.name}. Skipping the second header."
+            # Memory-map uncompressed input so lines come straight out of
+            # the page cache without read() copies, and tell the kernel
+            # this is a sequential scan so it prefetches ahead.
+            with open(source_csv_path, "rb") as fh:
+                infile = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                infile.madvise(mmap.MADV_SEQUENTIAL)
+            except (AttributeError, OSError):
+                pass
+
+        # mmap objects do not support line iteration directly
+        lines = iter(infile.readline, b"") if isinstance(infile, mmap.mmap) else infile
+
+        # Everything on the hot path stays bytes: the rows are never
+        # modified, so there is no reason to decode and re-encode them.
+        with infile:
+            header_line = infile.readline()
+            if not header_line.strip():
+                raise FileProcessingError(
+                    f"File {source_csv_path.name} is empty or has a blank header."
                 )
-
-            # Find the index of the date column
+            header = header_line.decode("utf-8", "ignore").rstrip("\r\n").split(",")
             try:
                 date_col_index = header.index(date_col)
                 logging.info(
@@ -119,30 +186,61 @@ def process_file(schema_file_path: Path, start_year: int, end_year: int):
                     f"Date column '{date_col}' not found in {source_csv_path.name}. Skipping file."
                 )
 
-            # Re-open the file to handle potential duplicate header check from a new stream
-            infile.seek(0)
-            reader = csv.reader(infile)
-            next(reader)  # Skip the first header row again
-
-            with open(filtered_csv_path, "w", newline="", encoding="utf-8") as outfile:
-                writer = csv.writer(outfile)
-                writer.writerow(header)
-
-                for i, row in enumerate(reader):
-                    # Skip the second header if it exists
-                    if i == 0 and len(row) == len(header) and row == header:
-                        continue
-
-                    if not row or len(row) <= date_col_index:
-                        continue
-
-                    date_str = row[date_col_index]
-                    year = parse_date_to_year(date_str)
-
-                    if year and start_year <= year <= end_year:
-                        writer.writerow(row)
+            # Only the date field needs parsing; split in C up to that field
+            # and pass the rest of the line through as-is, skipping the csv
+            # state machine and a full re-serialization of every row.
+            maxsplit = date_col_index + 1
+            with open(filtered_csv_path, "wb") as outfile:
+                outfile.write(header_line)
+                write = outfile.write
+                for line in lines:
+                    # A quoted field can span physical lines; such a record
+                    # has an odd number of quote bytes so far. Stitch
+                    # continuation lines until quotes balance so the csv
+                    # fallback (and the verbatim write) sees the whole
+                    # record instead of its fragments.
+                    if line.count(b'"') % 2 == 1:
+                        for continuation in lines:
+                            line += continuation
+                            if continuation.count(b'"') % 2 == 1:
+                                break
+
+                    if b'"' in line:
+                        # A quoted field (e.g. emp_title with embedded
+                        # commas) would misalign a naive split; parse just
+                        # this line with the csv module.
+                        row = next(csv.reader([line.decode("utf-8", "ignore")]))
+                        if len(row) <= date_col_index:
+                            continue
+                        date_field = row[date_col_index].encode("ascii", "replace")
+                    else:
+                        fields = line.split(b",", maxsplit)
+                        if len(fields) <= date_col_index:
+                            continue
+                        date_field = fields[date_col_index]
+
+                    try:
+                        year = year_fn(date_field)
+                    except IndexError:
+                        # Too short for the fixed layout (empty field, stray
+                        # duplicate header, ...); fall back to the tolerant
+                        # parser and let None fail the range check.
+                        year = parse_date_to_year(date_field.decode("utf-8", "ignore"))
+                        if year is None:
+                            continue
+
+                    if start_year <= year <= end_year:
+                        write(line)
                         rows_written += 1
 
+            if gz_file is not None and not index_path.exists():
+                try:
+                    gz_file.export_index(str(index_path))
+                except Exception as e:
+                    logging.warning(
+                        f"Could not export gzip index to {index_path.name}: {e}"
+                    )
+
         logging.info(
             f"Filtering completed for '{source_csv_path.name}'. Wrote {rows_written} rows to {filtered_csv_path.name}"
         )
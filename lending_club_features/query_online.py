@@ -1,22 +1,57 @@
+import functools
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
 from feast import FeatureStore
 
-# Initialize the FeatureStore
-store = FeatureStore(repo_path=".")
 
-# Sample input
-entity_row = {"loan_id": "1077430", "state": "CA"}
+@functools.lru_cache(maxsize=1)
+def _store() -> FeatureStore:
+    """
+    Build the FeatureStore on first use instead of at import: creating it
+    parses the feature repo, loads the registry, and opens online-store
+    connections, which each serving worker should pay exactly once.
+    """
+    return FeatureStore(repo_path=str(Path(__file__).resolve().parent))
+
+
+@functools.lru_cache(maxsize=1)
+def _feature_service():
+    """
+    Resolve the registered FeatureService once and reuse it: Feast fixed
+    its projection at registration time, so every call skips per-request
+    feature-ref string parsing and feature-view lookups.
+    """
+    return _store().get_feature_service("lending_club_services")
+
+
+def fetch(entity_rows: List[Dict]) -> pd.DataFrame:
+    """
+    Fetch online features for a batch of entity rows in one round trip.
+    A single call amortizes the fixed per-request latency into the
+    online store across all rows instead of paying it per row.
+    """
+    return _store().get_online_features(
+        features=_feature_service(), entity_rows=entity_rows
+    ).to_df()
+
+
+def fetch_dict(entity_rows: List[Dict]) -> Dict[str, list]:
+    """
+    Same as fetch() but returns plain columnar dicts, skipping the
+    pandas allocation when the consumer is a model predict call.
+    """
+    return _store().get_online_features(
+        features=_feature_service(), entity_rows=entity_rows
+    ).to_dict()
 
-# Define the features to retrieve
-features = [
-    "base_customer_features:loan_amount",
-    "base_customer_features:fico_band",
-    "geo_aggregates_monthly:state_rejects_in_month",
-]
 
-# Fetch features
-response = store.get_online_features(
-    features=features, entity_rows=[entity_row]
-).to_df()
+if __name__ == "__main__":
+    # Sample input: a batch of entity rows served by one call
+    entity_rows = [
+        {"loan_id": "1077430", "state": "CA"},
+    ]
 
-# Print result
-print(response)
+    # Print result
+    print(fetch(entity_rows))